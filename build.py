@@ -26,11 +26,17 @@ def set_properties(project):
     project.set_property("dir_source_unittest_python", "src/unittest/python")
     
     # Dependencies
-    project.depends_on("fastapi")
+    project.depends_on("fastapi", ">=0.100.0")
+    project.depends_on("anyio", ">=4.1.0")
     project.depends_on("sqlalchemy")
     project.depends_on("python-dotenv")
     project.depends_on("pydantic")
-    project.depends_on("uvicorn")
+    project.depends_on("msgspec")
+    project.depends_on("cachetools")
+    project.depends_on("uvicorn[standard]")
+    # Gunicorn is POSIX-only; run_app serves from plain uvicorn on Windows
+    project.depends_on("gunicorn", markers='sys_platform != "win32"')
+    project.depends_on("uvicorn-worker", markers='sys_platform != "win32"')
     project.build_depends_on("httpx")
     
     # Test settings
@@ -46,7 +52,7 @@ def set_properties(project):
     project.set_property("coverage_xml", True)
     
     # Distribution settings
-    project.set_property("distutils_console_scripts", ["product-api = app:run_app"])
+    project.set_property("distutils_console_scripts", ["product-api = app:run_app", "product-import = bulk_validate:main"])
     project.set_property("distutils_packages", ["src", "src.main", "src.main.python"])
     project.set_property("distutils_commands", ["sdist", "bdist_wheel"])
     
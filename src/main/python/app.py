@@ -1,20 +1,33 @@
 import os
+import sys
 import logging
-from fastapi import FastAPI, HTTPException, Depends, status
-from pydantic import BaseModel, validator, constr
+import threading
+from contextlib import asynccontextmanager
+import anyio
+import anyio.to_thread
+import msgspec
+from cachetools import TTLCache
+from fastapi import FastAPI, HTTPException, Depends, Response, status
 from typing import List, Optional
-from decimal import Decimal
-from sqlalchemy import create_engine, Column, Integer, String, Float, text
+from sqlalchemy import create_engine, event, exists, insert, select, Column, Integer, String, Float, text
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.engine import Connection
 from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.pool import NullPool
 
 # Import configuration
 try:
     # Try absolute import first (for when running as a package)
-    from config import get_db_config, API_CONFIG, TEST_MODE, LOG_LEVEL, LOG_FORMAT
+    from config import get_db_config, API_CONFIG, CACHE_CONFIG, SERVER_CONFIG, TEST_MODE, SKIP_SCHEMA_CREATE, LOG_LEVEL, LOG_FORMAT
 except ImportError:
     # Fall back to relative import (for when running as a module)
-    from src.main.python.config import get_db_config, API_CONFIG, TEST_MODE, LOG_LEVEL, LOG_FORMAT
+    from src.main.python.config import get_db_config, API_CONFIG, CACHE_CONFIG, SERVER_CONFIG, TEST_MODE, SKIP_SCHEMA_CREATE, LOG_LEVEL, LOG_FORMAT
+
+# Import request/response schemas
+try:
+    from schemas import ProductCreate, ProductUpdate, ProductOut, ProductRecord
+except ImportError:
+    from src.main.python.schemas import ProductCreate, ProductUpdate, ProductOut, ProductRecord
 
 # Configure logging
 logging.basicConfig(level=getattr(logging, LOG_LEVEL), format=LOG_FORMAT)
@@ -30,12 +43,54 @@ engine = create_engine(
     **db_config
 )
 
+# SQLite tuning: WAL lets reads proceed alongside a write and, with
+# synchronous=NORMAL, fsyncs at checkpoints rather than on every commit
+if engine.dialect.name == "sqlite":
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragma(dbapi_conn, connection_record):
+        cursor = dbapi_conn.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        cursor.close()
+
+# Engine for the /health probe. It has no pool to wait on, and its driver
+# timeouts end a ping that /health has already given up on, so abandoned
+# probe threads exit instead of piling up while the database hangs
+_health_timeout = max(1, round(API_CONFIG["health_timeout"]))
+_health_connect_args = {
+    "sqlite": {"timeout": API_CONFIG["health_timeout"]},
+    "mysql": {"connect_timeout": _health_timeout, "read_timeout": _health_timeout},
+    "postgresql": {
+        "connect_timeout": _health_timeout,
+        "options": f"-c statement_timeout={_health_timeout * 1000}",
+    },
+}.get(engine.dialect.name, {})
+health_engine = create_engine(
+    engine.url,
+    poolclass=NullPool,
+    connect_args={**db_config.get("connect_args", {}), **_health_connect_args}
+)
+
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 # Create base class for declarative models
 Base = declarative_base()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application startup and shutdown hooks"""
+    # Sync endpoints are dispatched to AnyIO worker threads; resize the pool
+    # only when configured, as threads beyond the database pool just wait
+    if API_CONFIG["threadpool_size"]:
+        limiter = anyio.to_thread.current_default_thread_limiter()
+        limiter.total_tokens = API_CONFIG["threadpool_size"]
+    if not SKIP_SCHEMA_CREATE and not _schema_created:
+        create_schema()
+    yield
+
 # Initialize FastAPI with configuration
 app = FastAPI(
     title=API_CONFIG["title"],
@@ -44,61 +99,71 @@ app = FastAPI(
     docs_url=API_CONFIG["docs_url"],
     redoc_url=API_CONFIG["redoc_url"],
     openapi_url=API_CONFIG["openapi_url"],
-    debug=API_CONFIG["debug"]
+    debug=API_CONFIG["debug"],
+    lifespan=lifespan
 )
 
 class Product(Base):
     __tablename__ = 'product'
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(120), unique=True, nullable=False)
+    name = Column(String(120), unique=True, index=True, nullable=False)
     description = Column(String(255))
     price = Column(Float, nullable=False)
 
-class ProductCreate(BaseModel):
-    name: constr(min_length=1, max_length=120)
-    description: constr(max_length=255) = ""
-    price: Decimal
-
-    @validator('name')
-    def validate_name(cls, v):
-        if len(v) > 120:
-            raise ValueError('Name must be 120 characters or less')
-        return v
-
-    @validator('description')
-    def validate_description(cls, v):
-        if len(v) > 255:
-            raise ValueError('Description must be 255 characters or less')
-        return v
-
-    @validator('price')
-    def validate_price(cls, v):
-        if v < 0:
-            raise ValueError('Price must be non-negative')
-        return v
-
-class ProductUpdate(BaseModel):
-    description: Optional[str] = None
-    price: Optional[Decimal] = None
-
-    @validator('description')
-    def validate_description(cls, v):
-        if v is not None and len(v) > 255:
-            raise ValueError('Description must be 255 characters or less')
-        return v
-
-    @validator('price')
-    def validate_price(cls, v):
-        if v is not None and v < 0:
-            raise ValueError('Price must be non-negative')
-        return v
-
-Base.metadata.create_all(bind=engine)
+# Set once the tables exist; gunicorn workers inherit it from the master
+_schema_created = False
+
+def create_schema():
+    """Create any missing tables; runs once at startup, not on import"""
+    global _schema_created
+    Base.metadata.create_all(bind=engine)
+    _schema_created = True
+
+# In-process cache for single-product lookups. Writes invalidate the entries
+# they touch; the TTL bounds staleness across separate worker processes.
+_cache_lock = threading.Lock()
+_by_id_cache = TTLCache(maxsize=CACHE_CONFIG["maxsize"], ttl=CACHE_CONFIG["ttl"])
+_by_name_cache = TTLCache(maxsize=CACHE_CONFIG["maxsize"], ttl=CACHE_CONFIG["ttl"])
+# Bumped on every invalidation; a read only caches its row if no write
+# happened between its cache lookup and its query
+_cache_generation = 0
+
+def _cached_lookup(cache, key):
+    """Return the cached product for key (or None) and the current cache generation"""
+    with _cache_lock:
+        if not CACHE_CONFIG["enabled"]:
+            return None, _cache_generation
+        return cache.get(key), _cache_generation
+
+def _cache_product(product, generation: int) -> ProductOut:
+    """Store a product row in both lookup caches and return its response model"""
+    cached = ProductOut.model_validate(product)
+    with _cache_lock:
+        # A write since the lookup may have committed after this row was read
+        if CACHE_CONFIG["enabled"] and generation == _cache_generation:
+            _by_id_cache[cached.id] = cached
+            _by_name_cache[cached.name] = cached
+    return cached
+
+def _invalidate_product(product_id: Optional[int], product_name: str):
+    """Drop a product from both lookup caches"""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _by_id_cache.pop(product_id, None)
+        _by_name_cache.pop(product_name, None)
+
+def clear_product_cache():
+    """Empty the product lookup caches"""
+    global _cache_generation
+    with _cache_lock:
+        _cache_generation += 1
+        _by_id_cache.clear()
+        _by_name_cache.clear()
 
 def get_db():
     db = SessionLocal()
     try:
-        db.execute(text('SELECT 1'))  # Test the connection
         yield db
     except Exception:
         db.rollback()
@@ -106,35 +171,69 @@ def get_db():
     finally:
         db.close()
 
-@app.get("/products", response_model=List[dict], status_code=status.HTTP_200_OK)
-def get_products(db: Session = Depends(get_db)):
+def get_conn():
+    """Core connection for read-only endpoints; no Session or identity map"""
+    with engine.connect() as conn:
+        yield conn
+
+class LazyConnection:
+    """Checks out a Core connection on first use, so cache hits never touch the pool"""
+
+    def __init__(self, connect=engine.connect):
+        self._connect = connect
+        self._conn = None
+
+    def get(self) -> Connection:
+        if self._conn is None:
+            self._conn = self._connect()
+        return self._conn
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+def get_lazy_conn():
+    """Connection provider for cached read endpoints"""
+    lazy = LazyConnection()
+    try:
+        yield lazy
+    finally:
+        lazy.close()
+
+# Column-level select shared by the read endpoints; rows are plain tuples
+_product_columns = select(Product.id, Product.name, Product.description, Product.price)
+
+# Reusable msgspec encoder for list responses
+_json_encoder = msgspec.json.Encoder()
+
+@app.get("/products", response_model=List[ProductOut], status_code=status.HTTP_200_OK)
+def get_products(conn: Connection = Depends(get_conn)):
     try:
-        products = db.query(Product).all()
-        return [
-            {"id": p.id, "name": p.name, "description": p.description, "price": float(p.price)}
-            for p in products
-        ]
+        # Encode rows straight to JSON bytes with msgspec; ProductOut is kept
+        # as the response model for the OpenAPI schema only
+        products = [ProductRecord(*row) for row in conn.execute(_product_columns)]
+        return Response(content=_json_encoder.encode(products), media_type="application/json")
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving products: {str(e)}"
         )
 
-@app.get("/products/{product_id}", status_code=status.HTTP_200_OK)
-def get_product_by_id(product_id: int, db: Session = Depends(get_db)):
+@app.get("/products/{product_id}", response_model=ProductOut, status_code=status.HTTP_200_OK)
+def get_product_by_id(product_id: int, conn: LazyConnection = Depends(get_lazy_conn)):
     try:
-        product = db.query(Product).filter(Product.id == product_id).first()
+        cached, generation = _cached_lookup(_by_id_cache, product_id)
+        if cached is not None:
+            return cached
+
+        product = conn.get().execute(_product_columns.where(Product.id == product_id)).first()
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product with id {product_id} not found"
             )
-        return {
-            "id": product.id,
-            "name": product.name,
-            "description": product.description,
-            "price": float(product.price)
-        }
+        return _cache_product(product, generation)
     except HTTPException:
         raise
     except Exception as e:
@@ -143,21 +242,20 @@ def get_product_by_id(product_id: int, db: Session = Depends(get_db)):
             detail=f"Error retrieving product: {str(e)}"
         )
 
-@app.get("/products/name/{product_name}", status_code=status.HTTP_200_OK)
-def get_product_by_name(product_name: str, db: Session = Depends(get_db)):
+@app.get("/products/name/{product_name}", response_model=ProductOut, status_code=status.HTTP_200_OK)
+def get_product_by_name(product_name: str, conn: LazyConnection = Depends(get_lazy_conn)):
     try:
-        product = db.query(Product).filter(Product.name == product_name).first()
+        cached, generation = _cached_lookup(_by_name_cache, product_name)
+        if cached is not None:
+            return cached
+
+        product = conn.get().execute(_product_columns.where(Product.name == product_name)).first()
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product with name '{product_name}' not found"
             )
-        return {
-            "id": product.id,
-            "name": product.name,
-            "description": product.description,
-            "price": float(product.price)
-        }
+        return _cache_product(product, generation)
     except HTTPException:
         raise
     except Exception as e:
@@ -169,25 +267,29 @@ def get_product_by_name(product_name: str, db: Session = Depends(get_db)):
 @app.post("/products", status_code=status.HTTP_201_CREATED)
 def create_product(product: ProductCreate, db: Session = Depends(get_db)):
     try:
-        if db.query(Product).filter(Product.name == product.name).first():
+        if db.scalar(select(exists().where(Product.name == product.name))):
             raise HTTPException(
                 status_code=status.HTTP_409_CONFLICT,
                 detail=f"Product with name '{product.name}' already exists"
             )
         
-        new_product = Product(
-            name=product.name,
-            description=product.description,
-            price=float(product.price)
+        # Single INSERT; the new id comes back via RETURNING or the cursor's
+        # lastrowid depending on the backend, so no refresh SELECT is needed
+        result = db.execute(
+            insert(Product).values(
+                name=product.name,
+                description=product.description,
+                price=product.price
+            )
         )
-        db.add(new_product)
         db.commit()
-        db.refresh(new_product)
+        new_id = result.inserted_primary_key[0]
+        _invalidate_product(new_id, product.name)
         
         return {
             "msg": "Product created successfully",
-            "id": new_product.id,
-            "name": new_product.name
+            "id": new_id,
+            "name": product.name
         }
     except HTTPException:
         raise
@@ -198,6 +300,54 @@ def create_product(product: ProductCreate, db: Session = Depends(get_db)):
             detail=f"Error creating product: {str(e)}"
         )
 
+def insert_products(db: Session, products: List[ProductCreate]):
+    """
+    Insert products in one executemany INSERT, skipping names that already exist.
+    
+    Args:
+        db: Session to insert and commit with
+        products: Validated products; repeated names after the first are skipped
+    
+    Returns:
+        Tuple[int, List[str]]: Number of products created and the skipped names
+    """
+    names = [product.name for product in products]
+    existing = set(db.scalars(select(Product.name).where(Product.name.in_(names))))
+
+    new_rows = []
+    skipped = []
+    for product in products:
+        if product.name in existing:
+            skipped.append(product.name)
+            continue
+        existing.add(product.name)  # Also drops repeats within the batch
+        new_rows.append(product.model_dump())
+
+    if new_rows:
+        # executemany-style INSERT; no ORM objects or per-row flush events
+        db.execute(insert(Product), new_rows)
+        db.commit()
+        for row in new_rows:
+            _invalidate_product(None, row["name"])
+    return len(new_rows), skipped
+
+@app.post("/products/bulk", status_code=status.HTTP_201_CREATED)
+def create_products(products: List[ProductCreate], db: Session = Depends(get_db)):
+    """Create many products in one round trip; names that already exist are skipped"""
+    try:
+        created, skipped = insert_products(db, products)
+        return {
+            "msg": "Products created successfully",
+            "created": created,
+            "skipped": skipped
+        }
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error creating products: {str(e)}"
+        )
+
 @app.delete("/products/{product_id}", status_code=status.HTTP_200_OK)
 def delete_product(product_id: int, db: Session = Depends(get_db)):
     try:
@@ -207,12 +357,14 @@ def delete_product(product_id: int, db: Session = Depends(get_db)):
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Product with id {product_id} not found"
             )
+        product_name = product.name
         db.delete(product)
         db.commit()
+        _invalidate_product(product_id, product_name)
         return {
             "msg": "Product deleted successfully",
             "id": product_id,
-            "name": product.name
+            "name": product_name
         }
     except HTTPException:
         raise
@@ -240,13 +392,14 @@ def update_product_by_name(product_name: str, update: ProductUpdate, db: Session
             product.description = update.description
             updates.append("description")
         if update.price is not None:
-            product.price = float(update.price) if update.price is not None else product.price
+            product.price = update.price
             updates.append("price")
 
         if not updates:
             return {"msg": "No fields to update"}
 
         db.commit()
+        _invalidate_product(product.id, product.name)
         return {
             "msg": "Product updated successfully",
             "id": product.id,
@@ -262,20 +415,31 @@ def update_product_by_name(product_name: str, update: ProductUpdate, db: Session
             detail=f"Error updating product: {str(e)}"
         )
 
+def _ping_database():
+    """Run SELECT 1 on a fresh connection with bounded driver timeouts"""
+    with health_engine.connect() as conn:
+        conn.execute(text('SELECT 1'))
+
 @app.get("/health", status_code=status.HTTP_200_OK)
-def health_check():
+async def health_check():
     """Health check endpoint for container health monitoring"""
     try:
-        # Test database connection
-        db = SessionLocal()
-        db.execute(text('SELECT 1'))
-        db.close()
+        # A hung database must not hang the probe: give up after the timeout
+        # and leave the blocked worker thread to finish on its own
+        with anyio.fail_after(API_CONFIG["health_timeout"]):
+            await anyio.to_thread.run_sync(_ping_database, abandon_on_cancel=True)
         
         return {
             "status": "healthy",
             "database": "connected",
             "version": API_CONFIG["version"]
         }
+    except TimeoutError:
+        logger.error("Health check timed out")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Service unhealthy: database did not respond within {API_CONFIG['health_timeout']}s"
+        )
     except Exception as e:
         logger.error(f"Health check failed: {str(e)}")
         raise HTTPException(
@@ -286,8 +450,58 @@ def health_check():
 
 def run_app():
     """Entry point for the console script to run the application"""
-    import uvicorn
-    uvicorn.run("src.main.python.app:app", host="0.0.0.0", port=80, log_level="info")
+    if sys.platform == "win32":
+        # Gunicorn is POSIX-only (and uvloop has no Windows build), so serve
+        # from a single uvicorn process instead
+        import uvicorn
+        uvicorn.run(
+            "src.main.python.app:app",
+            host=SERVER_CONFIG["host"],
+            port=SERVER_CONFIG["port"],
+            log_level="info",
+            loop="asyncio",
+            http="httptools"
+        )
+        return
+
+    from gunicorn.app.base import BaseApplication
+    from uvicorn_worker import UvicornWorker
+
+    class ProductUvicornWorker(UvicornWorker):
+        # Request uvloop/httptools explicitly so a missing uvicorn[standard]
+        # install fails at startup instead of falling back to asyncio/h11
+        CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools"}
+
+    class ProductApplication(BaseApplication):
+        """Gunicorn application serving the API from several uvicorn workers"""
+
+        def __init__(self, options):
+            self.options = options
+            super().__init__()
+
+        def load_config(self):
+            for key, value in self.options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            return app
+
+    def post_fork(server, worker):
+        # Forked workers must not reuse pooled connections opened by the master
+        engine.dispose(close=False)
+
+    # Create tables once in the master; forked workers see _schema_created
+    # and skip it in their lifespan instead of racing to create them
+    if not SKIP_SCHEMA_CREATE:
+        create_schema()
+
+    ProductApplication({
+        "bind": f"{SERVER_CONFIG['host']}:{SERVER_CONFIG['port']}",
+        "workers": SERVER_CONFIG["workers"],
+        "worker_class": ProductUvicornWorker,
+        "post_fork": post_fork,
+        "loglevel": "info",
+    }).run()
 
 
 if __name__ == "__main__":
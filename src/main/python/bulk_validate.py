@@ -0,0 +1,79 @@
+"""
+Bulk product import from CSV files.
+Validates a whole batch of product rows in a single pydantic-core call and
+inserts them with the same logic as POST /products/bulk.
+"""
+import argparse
+import csv
+import sys
+from typing import Iterable, List, Mapping, Optional
+from pydantic import TypeAdapter, ValidationError
+
+try:
+    from schemas import ProductCreate
+except ImportError:
+    from src.main.python.schemas import ProductCreate
+
+# Built once; validating the list runs the per-row checks inside pydantic-core
+_product_list = TypeAdapter(List[ProductCreate])
+
+def validate_products(rows: Iterable[Mapping]) -> List[ProductCreate]:
+    """
+    Validate a batch of product rows.
+    
+    Args:
+        rows: Mappings with name, description and price keys
+    
+    Returns:
+        List[ProductCreate]: Validated products, in input order
+    
+    Raises:
+        pydantic.ValidationError: Lists every invalid row by index
+    """
+    return _product_list.validate_python(list(rows))
+
+def read_products_csv(path: str) -> List[ProductCreate]:
+    """
+    Read and validate products from a CSV file with a header row.
+    
+    Args:
+        path: CSV file with name, description and price columns
+    
+    Returns:
+        List[ProductCreate]: Validated products, in file order
+    """
+    # utf-8-sig drops the byte order mark Excel writes, which would
+    # otherwise end up in the first header name
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        # Short rows get "" for their missing columns (an empty description is
+        # allowed, an empty price is not); extra values land under a key the
+        # schema rejects, so both are reported against their row
+        return validate_products(csv.DictReader(f, restval="", restkey="extra_columns"))
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Console entry point: validate a products CSV and insert it into the database"""
+    parser = argparse.ArgumentParser(description="Import products from a CSV file")
+    parser.add_argument("path", help="CSV file with name, description and price columns")
+    args = parser.parse_args(argv)
+
+    try:
+        products = read_products_csv(args.path)
+    except ValidationError as e:
+        print(e, file=sys.stderr)
+        return 1
+    except (OSError, UnicodeDecodeError) as e:
+        print(f"Cannot read {args.path}: {e}", file=sys.stderr)
+        return 1
+
+    # Imported here so validation alone does not set up the database engine
+    try:
+        from app import SessionLocal, SKIP_SCHEMA_CREATE, create_schema, insert_products
+    except ImportError:
+        from src.main.python.app import SessionLocal, SKIP_SCHEMA_CREATE, create_schema, insert_products
+
+    if not SKIP_SCHEMA_CREATE:
+        create_schema()
+    with SessionLocal() as db:
+        created, skipped = insert_products(db, products)
+    print(f"Created {created} products, skipped {len(skipped)} existing")
+    return 0
@@ -19,6 +19,9 @@ load_dotenv()
 ENVIRONMENT = os.getenv("ENVIRONMENT", ENV_LOCAL).lower()
 TEST_MODE = os.getenv("TEST_MODE", "false").lower() == "true" or ENVIRONMENT == ENV_TEST
 
+# Skip creating tables at startup (e.g. when the schema is managed externally)
+SKIP_SCHEMA_CREATE = os.getenv("SKIP_SCHEMA_CREATE", "false").lower() == "true"
+
 # Database configuration
 DB_CONFIG = {
     # Default SQLite configuration for local development
@@ -82,6 +85,28 @@ API_CONFIG = {
     "redoc_url": "/redoc",
     "openapi_url": "/openapi.json",
     "debug": os.getenv("DEBUG", "false").lower() == "true",
+    # Worker threads for sync endpoints; None keeps AnyIO's default of 40
+    "threadpool_size": int(os.getenv("THREADPOOL_SIZE")) if os.getenv("THREADPOOL_SIZE") else None,
+    # Seconds /health waits for the database before reporting unhealthy
+    "health_timeout": float(os.getenv("HEALTH_CHECK_TIMEOUT", "5")),
+}
+
+# Server configuration
+SERVER_CONFIG = {
+    "host": os.getenv("HOST", "0.0.0.0"),
+    "port": int(os.getenv("PORT", "80")),
+    # Gunicorn's recommended default of (2 x cores) + 1 worker processes
+    "workers": int(os.getenv("WEB_CONCURRENCY", str(2 * (os.cpu_count() or 1) + 1))),
+}
+
+# Product lookup cache configuration. Each worker process has its own cache
+# and only sees its own writes, so it is off by default with several workers.
+CACHE_CONFIG = {
+    "enabled": os.getenv(
+        "PRODUCT_CACHE_ENABLED", str(SERVER_CONFIG["workers"] == 1)
+    ).lower() == "true",
+    "maxsize": int(os.getenv("PRODUCT_CACHE_SIZE", "10000")),
+    "ttl": int(os.getenv("PRODUCT_CACHE_TTL", "5")),
 }
 
 # Logging configuration
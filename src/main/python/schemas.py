@@ -0,0 +1,36 @@
+"""
+Pydantic schemas for the product API.
+Defines request bodies for creating/updating products and the response shapes.
+"""
+from typing import Optional
+import msgspec
+from pydantic import BaseModel, ConfigDict, Field, constr
+
+# Length and sign constraints are compiled into pydantic-core; no Python validators
+class ProductCreate(BaseModel):
+    model_config = ConfigDict(extra='forbid', validate_default=False, str_strip_whitespace=True)
+
+    name: constr(min_length=1, max_length=120)
+    description: constr(max_length=255) = ""
+    price: float = Field(ge=0, allow_inf_nan=False)
+
+class ProductUpdate(BaseModel):
+    model_config = ConfigDict(extra='forbid', validate_default=False, str_strip_whitespace=True)
+
+    description: Optional[constr(max_length=255)] = None
+    price: Optional[float] = Field(default=None, ge=0, allow_inf_nan=False)
+
+class ProductOut(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    name: str
+    description: Optional[str] = None
+    price: float
+
+class ProductRecord(msgspec.Struct):
+    """Product row encoded by msgspec on list endpoints; mirrors ProductOut"""
+    id: int
+    name: str
+    description: Optional[str]
+    price: float
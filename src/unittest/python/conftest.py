@@ -0,0 +1,15 @@
+import os
+import sys
+
+# PyBuilder puts the main sources on the path when it runs the unit tests;
+# do the same once per session when the tests are run with pytest
+main_python_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../main/python'))
+if main_python_dir not in sys.path:
+    sys.path.insert(0, main_python_dir)
+
+# The test directories are packages, so pytest also puts the project root
+# first on the path, where the top-level app.py shim would shadow the real
+# module; import it here, in test mode, so the test modules get the cached one
+os.environ['TEST_MODE'] = 'true'
+os.environ['PRODUCT_CACHE_ENABLED'] = 'true'
+import app  # noqa: E402,F401
@@ -1,83 +1,154 @@
-import sys
 import os
+import asyncio
+import threading
 import unittest
-from fastapi.testclient import TestClient
-from sqlalchemy import create_engine, text
+from unittest import mock
+import httpx
+from pydantic import ValidationError
+from sqlalchemy import create_engine, event, inspect, text
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool, StaticPool
 
-# Set test mode
+# Set test mode; the product cache is on so its invalidation is exercised
 os.environ['TEST_MODE'] = 'true'
-
-# Add project root to path
-project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..'))
-sys.path.insert(0, project_root)
-
-# Add main python directory to path
-main_python_dir = os.path.join(project_root, 'src', 'main', 'python')
-sys.path.insert(0, main_python_dir)
+os.environ['PRODUCT_CACHE_ENABLED'] = 'true'
 
 # Import the app module
-from app import app, Base, Product, ProductCreate, ProductUpdate, get_db
+from app import (
+    app, Base, Product, ProductCreate, ProductUpdate, LazyConnection, API_CONFIG,
+    get_db, get_conn, get_lazy_conn, clear_product_cache, lifespan,
+    engine as app_engine, health_engine,
+    _cached_lookup, _invalidate_product, _by_id_cache
+)
 
-# Create test database
+# Test database; the engine, schema and client are set up once per module
 TEST_DB_URL = "sqlite:///:memory:"
-engine = create_engine(
-    TEST_DB_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool  # This ensures single connection for in-memory SQLite
+engine = None
+
+# Durability is irrelevant for a throwaway in-memory database, so skip
+# syncing and journaling work; StaticPool keeps a single connection, which
+# makes the exclusive lock safe
+TEST_PRAGMAS = (
+    "PRAGMA synchronous=OFF;"
+    "PRAGMA journal_mode=MEMORY;"
+    "PRAGMA locking_mode=EXCLUSIVE;"
+    "PRAGMA temp_store=MEMORY;"
+    "PRAGMA cache_size=-8000;"
 )
 
-# Create all tables in the engine
-Base.metadata.create_all(bind=engine)
+# pysqlite defers BEGIN on its own, which breaks SAVEPOINTs; let SQLAlchemy
+# emit BEGIN itself so test transactions can be nested and rolled back
+def do_connect(dbapi_connection, connection_record):
+    dbapi_connection.executescript(TEST_PRAGMAS)
+    dbapi_connection.isolation_level = None
+
+def do_begin(conn):
+    conn.exec_driver_sql("BEGIN")
 
-# Create session factory
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create session factory; when bound to a test connection, sessions join its
+# transaction and their commits only release a SAVEPOINT
+TestingSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    join_transaction_mode="create_savepoint"
+)
+
+# Connection the current test class runs on; each test's transaction on it
+# is rolled back in tearDown
+test_connection = None
 
 # Override the get_db dependency
 def override_get_db():
+    db = TestingSessionLocal()
     try:
-        db = TestingSessionLocal()
-        db.execute(text('SELECT 1'))  # Test connection
         yield db
     finally:
         db.close()
 
+# Override the get_conn dependency used by read endpoints
+def override_get_conn():
+    yield test_connection
+
+# Override the lazy connection provider used by cached read endpoints; the
+# test connection is owned by the test class, so the provider never closes it
+def override_get_lazy_conn():
+    yield LazyConnection(lambda: test_connection)
+
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_conn] = override_get_conn
+app.dependency_overrides[get_lazy_conn] = override_get_lazy_conn
 
-# Create test client
-client = TestClient(app)
+# Test client shared by the whole module; requests are dispatched to the
+# ASGI app in-process
+client = None
 
-class TestProductAPI(unittest.TestCase):
-    """Test suite for Product API endpoints"""
+def setUpModule():
+    global engine, client
+    engine = create_engine(
+        TEST_DB_URL,
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool  # This ensures single connection for in-memory SQLite
+    )
+    event.listen(engine, "connect", do_connect)
+    event.listen(engine, "begin", do_begin)
+
+    # Build the schema once for every test in the module
+    Base.metadata.create_all(bind=engine)
+    TestingSessionLocal.configure(bind=engine)
+
+    transport = httpx.ASGITransport(app=app)
+    client = httpx.AsyncClient(transport=transport, base_url="http://test")
+
+def tearDownModule():
+    asyncio.run(client.aclose())
+    engine.dispose()
+
+# Request payloads shared by the API tests
+PEN = {"name": "Pen", "description": "Blue ink pen", "price": 10.50}
+PENCIL = {"name": "Pencil", "description": "HB", "price": 5.0}
+ERASER = {"name": "Eraser", "description": "Rubber", "price": 2.0}
+SHARPENER = {"name": "Sharpener", "description": "Steel", "price": 3.0}
+MARKER = {"name": "Marker", "description": "Red", "price": 15.0}
+GLUE = {"name": "Glue", "description": "Stick", "price": 8.0}
+RULER = {"name": "Ruler", "description": "Wood", "price": 4.0}
+SCALE = {"name": "Scale", "description": "30cm", "price": 12.0}
+NOTEBOOK = {"name": "Notebook", "description": "Lined", "price": 30.0}
+STAPLER = {"name": "Stapler", "description": "Metal", "price": 25.0}
+CONCURRENT = {"name": "Concurrent", "description": "Test", "price": 10.0}
+
+def post_product(payload):
+    return client.post("/products", json=payload)
+
+class _CleanDBCase(unittest.IsolatedAsyncioTestCase):
+    """Base for API tests that run each test in a rolled-back transaction"""
     
     @classmethod
     def setUpClass(cls):
-        # Create tables once for all tests
-        Base.metadata.create_all(bind=engine)
-
-    def setUp(self):
-        # Clear all tables before each test
-        with engine.begin() as conn:
-            for table in reversed(Base.metadata.sorted_tables):
-                conn.execute(text(f'DELETE FROM {table.name}'))
-        # VACUUM must be run outside transaction
-        with engine.connect() as conn:
-            conn.execute(text('VACUUM'))
-            conn.commit()
+        # Tables are created in setUpModule; keep one connection for the class
+        global test_connection
+        test_connection = engine.connect()
+        TestingSessionLocal.configure(bind=test_connection)
 
     @classmethod
     def tearDownClass(cls):
-        # Drop all tables after all tests
-        Base.metadata.drop_all(bind=engine)
+        test_connection.close()
+        TestingSessionLocal.configure(bind=engine)
+
+    def setUp(self):
+        # Run each test inside a transaction that is rolled back afterwards
+        clear_product_cache()
+        self.transaction = test_connection.begin()
+
+    def tearDown(self):
+        self.transaction.rollback()
+
+
+class TestProductAPI(_CleanDBCase):
+    """Test suite for Product API endpoints"""
     
-    def test_create_product(self):
+    async def test_create_product(self):
         """Test successful product creation"""
-        response = client.post("/products", json={
-            "name": "Pen",
-            "description": "Blue ink pen",
-            "price": 10.50
-        })
+        response = await post_product(PEN)
         self.assertEqual(response.status_code, 201)
         json_data = response.json()
         self.assertEqual(json_data["msg"], "Product created successfully")
@@ -85,42 +156,45 @@ class TestProductAPI(unittest.TestCase):
         self.assertEqual(json_data["name"], "Pen")
         
         # Verify product was actually created
-        get_response = client.get(f"/products/{json_data['id']}")
+        get_response = await client.get(f"/products/{json_data['id']}")
         self.assertEqual(get_response.status_code, 200)
-        self.assertEqual(get_response.json()["name"], "Pen")
-        self.assertEqual(get_response.json()["price"], 10.50)
+        product = get_response.json()
+        self.assertEqual(product["name"], "Pen")
+        self.assertEqual(product["price"], 10.50)
     
-    def test_get_all_products(self):
-        client.post("/products", json={"name": "Pencil", "description": "HB", "price": 5.0})
-        response = client.get("/products")
+    async def test_get_all_products(self):
+        await post_product(PENCIL)
+        response = await client.get("/products")
         self.assertEqual(response.status_code, 200)
-        self.assertIsInstance(response.json(), list)
-        self.assertGreaterEqual(len(response.json()), 1)
-    
-    def test_get_product_by_id(self):
-        client.post("/products", json={"name": "Eraser", "description": "Rubber", "price": 2.0})
-        response = client.get("/products/1")
+        products = response.json()
+        self.assertIsInstance(products, list)
+        self.assertGreaterEqual(len(products), 1)
+        self.assertEqual(response.headers["content-type"], "application/json")
+        self.assertEqual(
+            products[0],
+            {"id": 1, "name": "Pencil", "description": "HB", "price": 5.0}
+        )
+    
+    async def test_get_product_by_id(self):
+        await post_product(ERASER)
+        response = await client.get("/products/1")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["name"], "Eraser")
     
-    def test_get_product_by_name(self):
-        client.post("/products", json={"name": "Sharpener", "description": "Steel", "price": 3.0})
-        response = client.get("/products/name/Sharpener")
+    async def test_get_product_by_name(self):
+        await post_product(SHARPENER)
+        response = await client.get("/products/name/Sharpener")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.json()["name"], "Sharpener")
     
-    def test_update_product_by_name(self):
+    async def test_update_product_by_name(self):
         """Test successful product update"""
         # Create test product
-        create_response = client.post("/products", json={
-            "name": "Marker",
-            "description": "Red",
-            "price": 15.0
-        })
+        create_response = await post_product(MARKER)
         self.assertEqual(create_response.status_code, 201)
         
         # Update product
-        update_response = client.put("/products/name/Marker", json={
+        update_response = await client.put("/products/name/Marker", json={
             "description": "Black",
             "price": 20.0
         })
@@ -130,24 +204,21 @@ class TestProductAPI(unittest.TestCase):
         self.assertEqual(set(json_data["updated_fields"]), {"description", "price"})
         
         # Verify updates
-        get_response = client.get(f"/products/{json_data['id']}")
+        get_response = await client.get(f"/products/{json_data['id']}")
         self.assertEqual(get_response.status_code, 200)
-        self.assertEqual(get_response.json()["description"], "Black")
-        self.assertEqual(get_response.json()["price"], 20.0)
+        product = get_response.json()
+        self.assertEqual(product["description"], "Black")
+        self.assertEqual(product["price"], 20.0)
     
-    def test_delete_product(self):
+    async def test_delete_product(self):
         """Test successful product deletion"""
         # Create test product
-        create_response = client.post("/products", json={
-            "name": "Glue",
-            "description": "Stick",
-            "price": 8.0
-        })
+        create_response = await post_product(GLUE)
         self.assertEqual(create_response.status_code, 201)
         product_id = create_response.json()["id"]
         
         # Delete product
-        delete_response = client.delete(f"/products/{product_id}")
+        delete_response = await client.delete(f"/products/{product_id}")
         self.assertEqual(delete_response.status_code, 200)
         json_data = delete_response.json()
         self.assertEqual(json_data["msg"], "Product deleted successfully")
@@ -155,89 +226,166 @@ class TestProductAPI(unittest.TestCase):
         self.assertEqual(json_data["name"], "Glue")
         
         # Verify product is deleted
-        get_response = client.get(f"/products/{product_id}")
+        get_response = await client.get(f"/products/{product_id}")
         self.assertEqual(get_response.status_code, 404)
     
-    def test_get_nonexistent_product(self):
-        response = client.get("/products/9999")
+    async def test_delete_invalidates_cached_product(self):
+        """Test that a cached lookup is dropped when the product is deleted"""
+        create_response = await post_product(RULER)
+        product_id = create_response.json()["id"]
+        self.assertEqual((await client.get(f"/products/{product_id}")).status_code, 200)
+        self.assertEqual((await client.get("/products/name/Ruler")).status_code, 200)
+        
+        await client.delete(f"/products/{product_id}")
+        self.assertEqual((await client.get(f"/products/{product_id}")).status_code, 404)
+        self.assertEqual((await client.get("/products/name/Ruler")).status_code, 404)
+    
+    async def test_update_during_read_is_not_cached_stale(self):
+        """Test that a row read before a concurrent update is not cached"""
+        await post_product(MARKER)
+        
+        # Let an update commit after the GET has read its row but before it
+        # stores that row in the cache
+        class RacingConnection:
+            def execute(self, stmt):
+                rows = test_connection.execute(stmt).freeze()
+                with TestingSessionLocal() as db:
+                    product = db.query(Product).filter(Product.name == "Marker").first()
+                    product.price = 20.0
+                    db.commit()
+                    _invalidate_product(product.id, product.name)
+                return rows()
+        def racing_lazy_conn():
+            yield LazyConnection(RacingConnection)
+        app.dependency_overrides[get_lazy_conn] = racing_lazy_conn
+        try:
+            response = await client.get("/products/name/Marker")
+        finally:
+            app.dependency_overrides[get_lazy_conn] = override_get_lazy_conn
+        self.assertEqual(response.json()["price"], 15.0)  # The racing read saw v1
+        
+        # The stale row must not have been cached
+        cached, _ = _cached_lookup(_by_id_cache, response.json()["id"])
+        self.assertIsNone(cached)
+        self.assertEqual((await client.get("/products/name/Marker")).json()["price"], 20.0)
+    
+    async def test_cached_lookup_skips_connection(self):
+        """Test that a cache hit is served without checking out a connection"""
+        await post_product(PEN)
+        self.assertEqual((await client.get("/products/1")).status_code, 200)
+        
+        checkouts = []
+        def counting_connect():
+            checkouts.append(1)
+            return test_connection
+        def counting_lazy_conn():
+            yield LazyConnection(counting_connect)
+        app.dependency_overrides[get_lazy_conn] = counting_lazy_conn
+        try:
+            for _ in range(3):
+                self.assertEqual((await client.get("/products/1")).json()["name"], "Pen")
+        finally:
+            app.dependency_overrides[get_lazy_conn] = override_get_lazy_conn
+        self.assertEqual(checkouts, [])
+    
+    async def test_create_products_bulk(self):
+        """Test bulk creation skips existing and repeated names"""
+        await post_product(PEN)
+        response = await client.post("/products/bulk", json=[
+            {"name": "Pen", "description": "Red ink pen", "price": 11.0},
+            PENCIL,
+            ERASER,
+            {"name": "Pencil", "description": "2B", "price": 6.0}
+        ])
+        self.assertEqual(response.status_code, 201)
+        json_data = response.json()
+        self.assertEqual(json_data["created"], 2)
+        self.assertEqual(json_data["skipped"], ["Pen", "Pencil"])
+        
+        # Verify only the new products were inserted
+        products = (await client.get("/products")).json()
+        self.assertEqual(sorted(p["name"] for p in products), ["Eraser", "Pen", "Pencil"])
+        self.assertEqual((await client.get("/products/name/Pencil")).json()["description"], "HB")
+    
+    async def test_create_products_bulk_invalid_item(self):
+        response = await client.post("/products/bulk", json=[
+            PENCIL,
+            {**ERASER, "price": -2.0}
+        ])
+        self.assertEqual(response.status_code, 422)  # Whole batch is rejected
+        self.assertEqual((await client.get("/products")).json(), [])
+    
+    async def test_get_nonexistent_product(self):
+        response = await client.get("/products/9999")
         self.assertEqual(response.status_code, 404)
     
-    def test_create_duplicate_product(self):
-        client.post("/products", json={"name": "Scale", "description": "30cm", "price": 12.0})
-        response = client.post("/products", json={"name": "Scale", "description": "15cm", "price": 8.0})
+    async def test_create_duplicate_product(self):
+        await post_product(SCALE)
+        response = await post_product({**SCALE, "description": "15cm", "price": 8.0})
         self.assertEqual(response.status_code, 409)  # Conflict status code for duplicate
     
-    def test_create_product_missing_fields(self):
-        response = client.post("/products", json={"description": "No name", "price": 5.0})
+    async def test_create_product_missing_fields(self):
+        response = await post_product({"description": "No name", "price": 5.0})
         self.assertEqual(response.status_code, 422)  # FastAPI returns 422 for validation errors
     
-    def test_update_nonexistent_product(self):
-        response = client.put("/products/name/NonExistentProduct", json={"description": "New desc", "price": 25.0})
+    async def test_update_nonexistent_product(self):
+        response = await client.put("/products/name/NonExistentProduct", json={"description": "New desc", "price": 25.0})
         self.assertEqual(response.status_code, 404)
     
-    def test_get_product_by_nonexistent_name(self):
-        response = client.get("/products/name/NonExistentProduct")
+    async def test_get_product_by_nonexistent_name(self):
+        response = await client.get("/products/name/NonExistentProduct")
         self.assertEqual(response.status_code, 404)
     
-    def test_partial_update_product(self):
+    async def test_partial_update_product(self):
         """Test partial updates with individual fields"""
         # Create test product
-        create_response = client.post("/products", json={
-            "name": "Notebook",
-            "description": "Lined",
-            "price": 30.0
-        })
+        create_response = await post_product(NOTEBOOK)
         self.assertEqual(create_response.status_code, 201)
         
         # Update only description
-        desc_response = client.put("/products/name/Notebook", json={
+        desc_response = await client.put("/products/name/Notebook", json={
             "description": "Graph paper"
         })
         self.assertEqual(desc_response.status_code, 200)
         self.assertEqual(set(desc_response.json()["updated_fields"]), {"description"})
         
         # Verify description update
-        get_response = client.get("/products/name/Notebook")
-        self.assertEqual(get_response.json()["description"], "Graph paper")
-        self.assertEqual(get_response.json()["price"], 30.0)  # Price unchanged
+        get_response = await client.get("/products/name/Notebook")
+        product = get_response.json()
+        self.assertEqual(product["description"], "Graph paper")
+        self.assertEqual(product["price"], 30.0)  # Price unchanged
         
         # Update only price
-        price_response = client.put("/products/name/Notebook", json={
+        price_response = await client.put("/products/name/Notebook", json={
             "price": 25.0
         })
         self.assertEqual(price_response.status_code, 200)
         self.assertEqual(set(price_response.json()["updated_fields"]), {"price"})
         
         # Verify price update
-        get_response = client.get("/products/name/Notebook")
-        self.assertEqual(get_response.json()["description"], "Graph paper")  # Description unchanged
-        self.assertEqual(get_response.json()["price"], 25.0)
+        get_response = await client.get("/products/name/Notebook")
+        product = get_response.json()
+        self.assertEqual(product["description"], "Graph paper")  # Description unchanged
+        self.assertEqual(product["price"], 25.0)
     
-    def test_delete_nonexistent_product(self):
-        response = client.delete("/products/9999")
+    async def test_delete_nonexistent_product(self):
+        response = await client.delete("/products/9999")
         self.assertEqual(response.status_code, 404)
     
-    def test_partial_update_price_only(self):
-        client.post("/products", json={"name": "Stapler", "description": "Metal", "price": 25.0})
+    async def test_partial_update_price_only(self):
+        await post_product(STAPLER)
         # Update only price
-        response = client.put("/products/name/Stapler", json={"price": 22.5})
+        response = await client.put("/products/name/Stapler", json={"price": 22.5})
         self.assertEqual(response.status_code, 200)
         # Verify the update
-        get_response = client.get("/products/name/Stapler")
-        self.assertEqual(get_response.json()["description"], "Metal")  # Description unchanged
-        self.assertEqual(get_response.json()["price"], 22.5)  # Price updated
+        get_response = await client.get("/products/name/Stapler")
+        product = get_response.json()
+        self.assertEqual(product["description"], "Metal")  # Description unchanged
+        self.assertEqual(product["price"], 22.5)  # Price updated
 
 
 class TestModels(unittest.TestCase):
     
-    def setUp(self):
-        # Create the tables before each test
-        Base.metadata.create_all(bind=engine)
-    
-    def tearDown(self):
-        # Drop the tables after each test
-        Base.metadata.drop_all(bind=engine)
-    
     def test_product_model_creation(self):
         # Use context manager for database session
         with TestingSessionLocal() as db:
@@ -290,75 +438,76 @@ class TestModels(unittest.TestCase):
         self.assertEqual(float(price_update.price), 45.99)
 
 
-class TestErrorHandling(unittest.TestCase):
+class TestErrorHandling(_CleanDBCase):
     """Test suite for API error handling"""
     
-    @classmethod
-    def setUpClass(cls):
-        # Create tables once for all tests
-        Base.metadata.create_all(bind=engine)
-    
-    def setUp(self):
-        # Clear all tables before each test
-        with engine.begin() as conn:
-            for table in reversed(Base.metadata.sorted_tables):
-                conn.execute(text(f'DELETE FROM {table.name}'))
-        with engine.connect() as conn:
-            conn.execute(text('VACUUM'))
-            conn.commit()
-    
-    @classmethod
-    def tearDownClass(cls):
-        # Drop all tables after all tests
-        Base.metadata.drop_all(bind=engine)
-    
-    def test_internal_server_error_handling(self):
+    async def test_internal_server_error_handling(self):
         """Test 500 error handling with invalid SQL"""
         # Force an internal error by passing invalid data type
-        response = client.post("/products", json={
+        response = await post_product({
             "name": "Test",
             "description": "Test",
             "price": "invalid"
         })
         self.assertEqual(response.status_code, 422)
     
-    def test_concurrent_updates(self):
+    async def test_concurrent_updates(self):
         """Test handling concurrent updates to same product"""
         # Create initial product
-        client.post("/products", json={
-            "name": "Concurrent",
-            "description": "Test",
-            "price": 10.0
-        })
+        await post_product(CONCURRENT)
         
         # Simulate concurrent updates
-        response1 = client.put("/products/name/Concurrent", json={"price": 20.0})
-        response2 = client.put("/products/name/Concurrent", json={"price": 30.0})
+        response1 = await client.put("/products/name/Concurrent", json={"price": 20.0})
+        response2 = await client.put("/products/name/Concurrent", json={"price": 30.0})
         
         self.assertEqual(response1.status_code, 200)
         self.assertEqual(response2.status_code, 200)
         
         # Verify final state
-        get_response = client.get("/products/name/Concurrent")
+        get_response = await client.get("/products/name/Concurrent")
         self.assertEqual(get_response.json()["price"], 30.0)
 
 
-class TestValidation(unittest.TestCase):
+class TestHealthCheck(unittest.IsolatedAsyncioTestCase):
+    """Test suite for the health check endpoint"""
+    
+    async def test_health_check(self):
+        response = await client.get("/health")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["database"], "connected")
+    
+    def test_health_engine_does_not_pool(self):
+        # Probes never wait on the request pool or hold a pooled connection
+        self.assertIsInstance(health_engine.pool, NullPool)
+    
+    async def test_health_check_times_out(self):
+        # A database that never answers is reported as unhealthy
+        release = threading.Event()
+        with mock.patch("app._ping_database", lambda: release.wait(5)), \
+                mock.patch.dict(API_CONFIG, {"health_timeout": 0.05}):
+            try:
+                response = await client.get("/health")
+            finally:
+                release.set()
+        self.assertEqual(response.status_code, 503)
+
+
+class TestValidation(unittest.IsolatedAsyncioTestCase):
     """Test suite for input validation"""
     
     def test_product_name_required(self):
         # Test that product name is required
-        with self.assertRaises(Exception):
+        with self.assertRaises(ValidationError):
             ProductCreate(description="Missing name", price=10.0)
     
     def test_product_price_required(self):
         # Test that product price is required
-        with self.assertRaises(Exception):
+        with self.assertRaises(ValidationError):
             ProductCreate(name="Test", description="Missing price")
     
     def test_product_price_type(self):
         # Test that product price must be a number
-        with self.assertRaises(Exception):
+        with self.assertRaises(ValidationError):
             ProductCreate(name="Test", description="Invalid price", price="not a number")
     
     def test_product_description_default(self):
@@ -366,40 +515,60 @@ class TestValidation(unittest.TestCase):
         product = ProductCreate(name="Test", price=10.0)
         self.assertEqual(product.description, "")
     
-    def test_product_price_negative(self):
+    async def test_product_price_negative(self):
         # Test creating product with negative price
-        response = client.post("/products", json={"name": "Test", "description": "Test", "price": -10.0})
+        response = await post_product({"name": "Test", "description": "Test", "price": -10.0})
         self.assertEqual(response.status_code, 422)  # Should fail validation
     
-    def test_product_name_too_long(self):
+    async def test_product_name_too_long(self):
         # Test creating product with name > 120 chars
         long_name = "x" * 121
-        response = client.post("/products", json={"name": long_name, "description": "Test", "price": 10.0})
+        response = await post_product({"name": long_name, "description": "Test", "price": 10.0})
         self.assertEqual(response.status_code, 422)  # Should fail validation
     
-    def test_product_description_too_long(self):
+    async def test_product_description_too_long(self):
         # Test creating product with description > 255 chars
         long_desc = "x" * 256
-        response = client.post("/products", json={"name": "Test", "description": long_desc, "price": 10.0})
+        response = await post_product({"name": "Test", "description": long_desc, "price": 10.0})
         self.assertEqual(response.status_code, 422)  # Should fail validation
 
+    def test_update_price_negative(self):
+        # Test that update model rejects negative price
+        with self.assertRaises(ValidationError):
+            ProductUpdate(price=-1.0)
+
+    async def test_product_unknown_field(self):
+        # Test that unknown fields are rejected
+        response = await post_product({"name": "Test", "price": 10.0, "colour": "red"})
+        self.assertEqual(response.status_code, 422)  # Should fail validation
+
+
+class TestStartup(unittest.TestCase):
+    """Test suite for application startup"""
+    
+    def run_lifespan(self):
+        async def start_and_stop():
+            async with lifespan(app):
+                pass
+        asyncio.run(start_and_stop())
+    
+    def test_lifespan_creates_tables(self):
+        Base.metadata.drop_all(bind=app_engine)
+        with mock.patch("app._schema_created", False):
+            self.run_lifespan()
+        self.assertTrue(inspect(app_engine).has_table("product"))
+    
+    def test_lifespan_skips_schema_created_by_master(self):
+        # Workers forked after run_app created the schema must not redo it
+        with mock.patch("app._schema_created", True), \
+                mock.patch.object(Base.metadata, "create_all") as create_all:
+            self.run_lifespan()
+        create_all.assert_not_called()
+
 
 class TestDatabaseSession(unittest.TestCase):
     """Test suite for database session management"""
     
-    def setUp(self):
-        # Create tables and clear data before each test
-        Base.metadata.create_all(bind=engine)
-        with engine.begin() as conn:
-            for table in reversed(Base.metadata.sorted_tables):
-                conn.execute(text(f'DELETE FROM {table.name}'))
-        with engine.connect() as conn:
-            conn.execute(text('VACUUM'))
-            conn.commit()
-    
-    def tearDown(self):
-        Base.metadata.drop_all(bind=engine)
-    
     def test_get_db_yields_session(self):
         # Test that get_db yields a session
         db_gen = get_db()
@@ -416,7 +585,26 @@ class TestDatabaseSession(unittest.TestCase):
         except StopIteration:
             pass  # Expected behavior when generator is exhausted
 
+    def test_lazy_conn_connects_on_first_use(self):
+        # Test that get_lazy_conn only opens a connection when asked for one
+        conn_gen = get_lazy_conn()
+        lazy = next(conn_gen)
+        conn = lazy.get()
+        self.assertIs(lazy.get(), conn)
 
-if __name__ == '__main__':
-    # Run tests with verbosity
-    unittest.main(verbosity=2)
+        # Clean up
+        with self.assertRaises(StopIteration):
+            next(conn_gen)
+        self.assertTrue(conn.closed)
+
+    def test_get_conn_yields_connection(self):
+        # Test that get_conn yields a Core connection that is closed afterwards
+        conn_gen = get_conn()
+        conn = next(conn_gen)
+
+        self.assertEqual(conn.execute(text('SELECT 1')).scalar(), 1)
+
+        # Clean up
+        with self.assertRaises(StopIteration):
+            next(conn_gen)
+        self.assertTrue(conn.closed)
@@ -0,0 +1,136 @@
+import os
+import io
+import tempfile
+import unittest
+from unittest import mock
+from contextlib import redirect_stderr, redirect_stdout
+from pydantic import ValidationError
+
+# Set test mode; the import command writes to the app's in-memory database
+os.environ['TEST_MODE'] = 'true'
+
+from bulk_validate import validate_products, read_products_csv, main
+
+def write_csv(content):
+    with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as f:
+        f.write(content)
+    return f.name
+
+class TestBulkValidate(unittest.TestCase):
+    """Test suite for bulk product validation"""
+    
+    def test_validate_products(self):
+        products = validate_products([
+            {"name": "Pen", "description": "Blue", "price": 10.5},
+            {"name": "Pencil", "price": "2"},
+        ])
+        self.assertEqual([p.name for p in products], ["Pen", "Pencil"])
+        self.assertEqual(products[1].price, 2.0)
+        self.assertEqual(products[1].description, "")
+    
+    def test_validate_products_reports_bad_rows(self):
+        with self.assertRaises(ValidationError) as ctx:
+            validate_products([
+                {"name": "Pen", "price": 10.5},
+                {"name": "Pencil", "price": -1},
+                {"name": "x" * 121, "price": 1},
+            ])
+        self.assertEqual({error["loc"][0] for error in ctx.exception.errors()}, {1, 2})
+    
+    def test_read_products_csv(self):
+        path = write_csv("name,description,price\nPen,Blue ink,10.50\nEraser,,2\n")
+        try:
+            products = read_products_csv(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(len(products), 2)
+        self.assertEqual(products[0].price, 10.5)
+        self.assertEqual(products[1].description, "")
+    
+    def test_read_products_csv_with_bom(self):
+        # Excel writes UTF-8 CSVs with a byte order mark
+        path = write_csv("\ufeffname,description,price\nPen,Blue ink,10.50\n")
+        try:
+            products = read_products_csv(path)
+        finally:
+            os.remove(path)
+        self.assertEqual(products[0].name, "Pen")
+    
+    def test_read_products_csv_short_and_long_rows(self):
+        path = write_csv("name,price,description\nPen,10.50\nEraser\nRuler,4,Wood,extra\n")
+        try:
+            with self.assertRaises(ValidationError) as ctx:
+                read_products_csv(path)
+        finally:
+            os.remove(path)
+        # A missing description defaults to empty; a missing price or an
+        # extra value is an error on its own row
+        self.assertEqual(
+            {(error["loc"][0], error["loc"][1]) for error in ctx.exception.errors()},
+            {(1, "price"), (2, "extra_columns")}
+        )
+
+
+class TestImportCommand(unittest.TestCase):
+    """Test suite for the product-import console script"""
+    
+    def setUp(self):
+        from app import SessionLocal, Product, create_schema, clear_product_cache
+        self.SessionLocal = SessionLocal
+        self.Product = Product
+        create_schema()
+        clear_product_cache()
+    
+    def tearDown(self):
+        with self.SessionLocal() as db:
+            db.query(self.Product).delete()
+            db.commit()
+    
+    def test_import_inserts_and_skips_existing(self):
+        path = write_csv("name,description,price\nPen,Blue ink,10.50\nEraser,,2\n")
+        try:
+            with redirect_stdout(io.StringIO()) as out:
+                self.assertEqual(main([path]), 0)
+                self.assertEqual(main([path]), 0)
+        finally:
+            os.remove(path)
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            ["Created 2 products, skipped 0 existing", "Created 0 products, skipped 2 existing"]
+        )
+        with self.SessionLocal() as db:
+            names = sorted(name for (name,) in db.query(self.Product.name))
+        self.assertEqual(names, ["Eraser", "Pen"])
+    
+    def test_import_rejects_invalid_file(self):
+        path = write_csv("name,description,price\nPen,Blue ink,10.50\nPencil,HB,-1\n")
+        try:
+            with redirect_stderr(io.StringIO()) as err:
+                self.assertEqual(main([path]), 1)
+        finally:
+            os.remove(path)
+        self.assertIn("price", err.getvalue())
+        with self.SessionLocal() as db:
+            self.assertEqual(db.query(self.Product).count(), 0)
+    
+    def test_import_reports_unreadable_file(self):
+        with tempfile.NamedTemporaryFile("wb", suffix=".csv", delete=False) as f:
+            f.write("name,description,price\nCaf\u00e9,,1\n".encode("latin-1"))
+        try:
+            for path in (f.name, f.name + ".missing"):
+                with redirect_stderr(io.StringIO()) as err:
+                    self.assertEqual(main([path]), 1)
+                self.assertIn("Cannot read", err.getvalue())
+        finally:
+            os.remove(f.name)
+    
+    def test_import_respects_skip_schema_create(self):
+        path = write_csv("name,description,price\nPen,Blue ink,10.50\n")
+        try:
+            with mock.patch("app.SKIP_SCHEMA_CREATE", True), \
+                    mock.patch("app.create_schema") as create_schema, \
+                    redirect_stdout(io.StringIO()):
+                self.assertEqual(main([path]), 0)
+        finally:
+            os.remove(path)
+        create_schema.assert_not_called()